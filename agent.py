@@ -4,13 +4,33 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+import asyncio
+import functools
 import os
-
+import re
+import sys
+import threading
+import time
+from typing import Awaitable, Callable, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+import httpx
+import numpy as np
+import orjson
 from dotenv import load_dotenv
 from loguru import logger
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
+from pipecat.adapters.schemas.function_schema import FunctionSchema
+from pipecat.adapters.schemas.tools_schema import ToolsSchema
 from pipecat.frames.frames import (
     Frame,
+    FunctionCallResultFrame,
+    InputAudioRawFrame,
+    InterimTranscriptionFrame,
+    InterruptionFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
     OutputTransportMessageFrame,
     TranscriptionFrame,
     TTSStoppedFrame,
@@ -19,6 +39,10 @@ from pipecat.frames.frames import (
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.aggregators.llm_response import (
+    LLMAssistantAggregatorParams,
+    LLMUserAggregatorParams,
+)
 from pipecat.processors.aggregators.openai_llm_context import (
     OpenAILLMContext,
     OpenAILLMContextFrame,
@@ -37,31 +61,213 @@ from pipecat.processors.transcript_processor import TranscriptProcessor
 from pipecat.runner.types import RunnerArguments
 from pipecat.runner.utils import create_transport
 from pipecat.services.elevenlabs.tts import ElevenLabsTTSService
-from pipecat.services.openai.llm import OpenAILLMService
+from pipecat.services.llm_service import FunctionCallParams
+from pipecat.services.openai.llm import (
+    OpenAIAssistantContextAggregator,
+    OpenAIContextAggregatorPair,
+    OpenAILLMService,
+    OpenAIUserContextAggregator,
+)
 from pipecat.services.speechmatics.stt import SpeechmaticsSTTService
 from pipecat.transcriptions.language import Language
 from pipecat.transports.base_transport import BaseTransport, TransportParams
-from pipecat.transports.daily.transport import DailyParams
-from pipecat.transports.websocket.fastapi import FastAPIWebsocketParams
 from pipecat.utils.time import time_now_iso8601
 
 load_dotenv(override=True)
 
+# Level used when LOG_LEVEL is unset. DEBUG matches both loguru's default sink
+# and the development runner; the runner's -v flag raises it to TRACE below.
+_default_log_level = "DEBUG"
+_logging_configured = False
+
+
+def _configure_logging():
+    """Move log output off the event loop onto loguru's writer thread.
+
+    Called from bot() rather than at import, because the development runner
+    replaces all sinks in main() after importing this module. `diagnose` and
+    `backtrace` are off so exceptions are not formatted with every frame's
+    locals.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
+        level=os.getenv("LOG_LEVEL", _default_log_level),
+    )
+
+
+# uvloop has lower per-callback scheduling overhead than the default loop, which
+# matters with three streaming network services per call. It is not available
+# on Windows.
+if sys.platform != "win32":
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+# System prompt for the Arabic agent. Kept byte-for-byte identical across sessions
+# so it forms a stable prefix for OpenAI prompt caching; any per-session content
+# must go in later messages, never ahead of or inside this block.
+_SYSTEM_PROMPT = (
+    "The user will be speaking Arabic. ONLY ever respond using Modern Standard Arabic (MSA). Assume the speaker is male unless they have told you otherwise.\n\n"
+    "أنت موظف استقبال ودود في مطعم برجر. اسمك سارة. "
+    "هدفك هو أخذ الطلبات بطريقة سريعة وواضحة ومساعدة العملاء في اختيار وجباتهم. "
+    "مخرجاتك ستتحول إلى صوت لذا لا تستخدم رموزًا خاصة أو إيموجي في إجاباتك. "
+    "استخدم علامات الترقيم دائمًا في ردودك. "
+    "قدم ردودًا قصيرة ومباشرة - لا تطيل إلا إذا لزم الأمر. "
+    "\n\n"
+    "استخدم الدالة get_menu لمعرفة الأصناف والأسعار قبل ذكرها أو حساب أي مجموع، ولا تخمن الأسعار أبدًا.\n"
+    "\n"
+    "عند أخذ الطلب:\n"
+    "١. رحب بالعميل واسأله عن طلبه\n"
+    "٢. استخدم علامات `<S1/>` `<S2/>` `<S3/>` لتمييز المتحدثين المختلفين - لا تستخدم هذه العلامات في ردودك أبدًا\n"
+    "٣. سجل من طلب ماذا بوضوح (مثال: الشخص الأول طلب برجر كلاسيك)\n"
+    "٤. اقترح الخيارات النباتية إذا سأل العميل أو بدا مهتمًا\n"
+    "٥. اسأل عن الإضافات: بطاطس ومشروبات\n"
+    "٦. أكد الطلب الكامل مع الأسعار قبل الإنهاء\n"
+    "٧. اذكر المجموع النهائي\n"
+    "\n"
+    "كن ودودًا وصبورًا ومساعدًا. إذا كان هناك عدة أشخاص يطلبون، تأكد من تتبع طلب كل شخص بدقة."
+)
+
+# Built once at import and shared by every session. Contexts get a shallow copy
+# of the tuple so aggregators can append to their own list; the message dicts
+# themselves are never modified.
+_SYSTEM_MESSAGES = ({"role": "system", "content": _SYSTEM_PROMPT},)
+
+# The menu is served through the get_menu tool instead of the system prompt, so
+# its tokens only enter the context on conversations that ask for it.
+_MENU = {
+    "currency": "ريال",
+    "burgers": [
+        {"name": "برجر كلاسيك", "price": 25},
+        {"name": "برجر دبل", "price": 35},
+        {"name": "برجر نباتي فلافل", "price": 22, "vegetarian": True},
+        {"name": "برجر خضار مشوي", "price": 24, "vegetarian": True},
+    ],
+    "sides": [
+        {"name": "بطاطس مقلية صغيرة", "price": 8},
+        {"name": "بطاطس مقلية كبيرة", "price": 12},
+    ],
+    "drinks": [
+        {"name": "كولا", "price": 7},
+        {"name": "سبرايت", "price": 7},
+        {"name": "عصير برتقال", "price": 7},
+        {"name": "ميلك شيك فانيليا", "price": 15},
+        {"name": "ميلك شيك شوكولاتة", "price": 15},
+    ],
+}
+
+_TOOLS = ToolsSchema(
+    standard_tools=[
+        FunctionSchema(
+            name="get_menu",
+            description="Get the restaurant menu with every item and its price in SAR.",
+            properties={},
+            required=[],
+        )
+    ]
+)
+
+
+async def _get_menu(params: FunctionCallParams):
+    await params.result_callback(_MENU)
+
+
+# Speechmatics diarization output, e.g. <S1>مرحبا</S1><S2>أهلا</S2>
+_DIARIZATION_RE = re.compile(r"<S(\d+)>([^<]*)</S\1>")
+
+
+def _format_speakers(text: str) -> str:
+    """Render diarization tags as "[S1] ... [S2] ..." for logging."""
+    segments = _DIARIZATION_RE.findall(text)
+    if not segments:
+        return text
+    return " ".join(f"[S{speaker}] {segment}" for speaker, segment in segments)
+
+
+class PartialTranscriptCoalescer(FrameProcessor):
+    """Forwards at most one interim transcript per `interval_secs`.
+
+    Speechmatics streams partial transcripts many times per second while the
+    user speaks, and the user context aggregator handles every one of them. A
+    partial that arrives too soon after the previous one is held, and newer
+    partials replace it. The held partial is forwarded ahead of the next
+    non-audio frame, so it keeps its place relative to frames such as
+    UserStoppedSpeakingFrame. Passthrough audio frames also release it once the
+    interval has elapsed. Final transcripts are forwarded immediately and
+    supersede any held partial.
+    """
+
+    def __init__(self, *, interval_secs: float = 0.08, **kwargs):
+        super().__init__(**kwargs)
+        self._interval_secs = interval_secs
+        self._pending: Optional[InterimTranscriptionFrame] = None
+        self._last_forward_time = 0.0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, InterimTranscriptionFrame):
+            self._pending = frame
+            if self._interval_elapsed():
+                await self._push_pending()
+            return
+
+        # Most frames are audio and arrive with nothing held; skip the checks.
+        if self._pending is not None:
+            if isinstance(frame, TranscriptionFrame):
+                self._pending = None
+            elif not isinstance(frame, InputAudioRawFrame) or self._interval_elapsed():
+                await self._push_pending()
+
+        await self.push_frame(frame, direction)
+
+    def _interval_elapsed(self) -> bool:
+        return time.monotonic() - self._last_forward_time >= self._interval_secs
+
+    async def _push_pending(self):
+        frame, self._pending = self._pending, None
+        if frame is not None:
+            self._last_forward_time = time.monotonic()
+            await self.push_frame(frame)
+
 
 class TranscriptionLogger(FrameProcessor):
     """Logs transcriptions with speaker diarization information."""
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Every frame in the pipeline (audio included) passes through here, so
+        # dispatch on the exact frame type instead of running isinstance checks.
+        # TranscriptionFrame has no subclasses, so exact matching is sufficient.
+        self._handlers = {TranscriptionFrame: self._log_transcription}
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
-        if isinstance(frame, TranscriptionFrame):
-            logger.info(f"Transcription: {frame.text}")
-            # If diarization is enabled, the text will include speaker tags like:
-            # <S1>مرحبا، كيف حالك؟</S1>
+        handler = self._handlers.get(type(frame))
+        if handler is not None:
+            handler(frame)
 
         # Push all frames through
         await self.push_frame(frame, direction)
 
+    def _log_transcription(self, frame: TranscriptionFrame):
+        # If diarization is enabled, the text will include speaker tags like:
+        # <S1>مرحبا، كيف حالك؟</S1>
+        # Parsing happens inside the lazy callable, so it is skipped entirely
+        # when no sink accepts INFO records.
+        logger.opt(lazy=True).info("Transcription: {}", lambda: _format_speakers(frame.text))
+
 
 class ElevenLabsTTSTranscriptService(ElevenLabsTTSService):
     """ElevenLabs TTS that also emits TTSTextFrame transcripts."""
@@ -72,18 +278,494 @@ class ElevenLabsTTSTranscriptService(ElevenLabsTTSService):
         self._push_text_frames = True
 
 
-# We store functions so objects don't get instantiated.
-# The function will be called when the desired transport gets selected.
-transport_params = {
-    "daily": lambda: DailyParams(
+@functools.lru_cache(maxsize=1)
+def _get_http_client() -> httpx.AsyncClient:
+    """HTTP connection pool shared by every OpenAI client in the process.
+
+    Created lazily on first use so it binds to the running event loop. Reusing
+    it keeps TCP/TLS connections to the API warm across sessions, and HTTP/2
+    lets concurrent requests share a single multiplexed connection.
+    """
+    return DefaultAsyncHttpxClient(
+        http2=True,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=64,
+            max_keepalive_connections=32,
+            keepalive_expiry=120,
+        ),
+    )
+
+
+class ArabicAssistantContextAggregator(OpenAIAssistantContextAggregator):
+    """Stores function call results as UTF-8 JSON.
+
+    The stock aggregator serializes results with json.dumps, which escapes every
+    Arabic character to a six-character \\uXXXX sequence and inflates the tokens
+    the menu costs in every following request.
+    """
+
+    async def handle_function_call_result(self, frame: FunctionCallResultFrame):
+        if not frame.result:
+            await super().handle_function_call_result(frame)
+            return
+        result = orjson.dumps(frame.result).decode()
+        await self._update_function_call_result(frame.function_name, frame.tool_call_id, result)
+
+
+class ArabicOpenAILLMService(OpenAILLMService):
+    """OpenAI LLM service tuned for this agent.
+
+    Uses the process-wide HTTP connection pool and keeps Arabic function call
+    results unescaped in the context.
+    """
+
+    def create_client(
+        self,
+        api_key=None,
+        base_url=None,
+        organization=None,
+        project=None,
+        default_headers=None,
+        **kwargs,
+    ):
+        return AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            organization=organization,
+            project=project,
+            http_client=_get_http_client(),
+            default_headers=default_headers,
+        )
+
+    def create_context_aggregator(
+        self,
+        context: OpenAILLMContext,
+        *,
+        user_params: LLMUserAggregatorParams = LLMUserAggregatorParams(),
+        assistant_params: LLMAssistantAggregatorParams = LLMAssistantAggregatorParams(),
+    ) -> OpenAIContextAggregatorPair:
+        context.set_llm_adapter(self.get_llm_adapter())
+        user = OpenAIUserContextAggregator(context, params=user_params)
+        assistant = ArabicAssistantContextAggregator(context, params=assistant_params)
+        return OpenAIContextAggregatorPair(_user=user, _assistant=assistant)
+
+
+async def _warmup():
+    """Open a connection to OpenAI ahead of the first LLM turn.
+
+    Runs while the transport is still connecting and leaves a warm TLS
+    connection in the shared pool for the greeting. The speech services open
+    their own per-session websockets when the pipeline starts.
+    """
+    try:
+        await _get_http_client().head("https://api.openai.com/v1")
+    except Exception as e:
+        logger.debug("Connection warmup failed: {}", e)
+
+
+# Embeds a batch of texts into an (n, dim) float32 matrix.
+Embedder = Callable[[List[str]], Awaitable[np.ndarray]]
+
+_embedding_client: Optional[AsyncOpenAI] = None
+
+
+async def _openai_embed(texts: List[str]) -> np.ndarray:
+    """Embed texts with OpenAI in a single batched request."""
+    global _embedding_client
+    if _embedding_client is None:
+        _embedding_client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"), http_client=_get_http_client()
+        )
+    response = await _embedding_client.embeddings.create(
+        model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+        input=texts,
+    )
+    return np.array([item.embedding for item in response.data], dtype=np.float32)
+
+
+class OnnxEmbedder:
+    """Local int8 sentence embedder, a drop-in replacement for `_openai_embed`.
+
+    Expects a directory holding a dynamically quantized ONNX export of
+    paraphrase-multilingual-MiniLM-L12-v2 (`model.onnx`) and its
+    `tokenizer.json`. The model is loaded on a worker thread by the first
+    request, not at import. Requests that arrive within `batch_window_secs` of
+    each other, e.g. from concurrent calls, are embedded in a single batch.
+    """
+
+    def __init__(self, model_dir: str, *, batch_window_secs: float = 0.02, num_threads: int = 2):
+        self._model_dir = model_dir
+        self._num_threads = num_threads
+        self._session = None
+        self._tokenizer = None
+        self._input_names: Set[str] = set()
+        self._load_lock = threading.Lock()
+
+        self._batch_window_secs = batch_window_secs
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+    async def __call__(self, texts: List[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((texts, future))
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._batch_window_secs, self._flush)
+        return await future
+
+    def _flush(self):
+        self._flush_handle = None
+        pending, self._pending = self._pending, []
+        task = asyncio.create_task(self._run_batch(pending))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, pending: List[Tuple[List[str], asyncio.Future]]):
+        texts = [text for batch, _ in pending for text in batch]
+        try:
+            vectors = await asyncio.to_thread(self._encode, texts)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for batch, future in pending:
+            if not future.done():
+                future.set_result(vectors[offset : offset + len(batch)])
+            offset += len(batch)
+
+    def _load(self):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self._num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(
+            os.path.join(self._model_dir, "model.onnx"),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        tokenizer = Tokenizer.from_file(os.path.join(self._model_dir, "tokenizer.json"))
+        tokenizer.enable_padding()
+        tokenizer.enable_truncation(max_length=128)
+
+        self._input_names = {i.name for i in session.get_inputs()}
+        self._tokenizer = tokenizer
+        self._session = session
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        # Runs on a worker thread; batches may overlap, so load under a lock.
+        if self._session is None:
+            with self._load_lock:
+                if self._session is None:
+                    self._load()
+
+        encodings = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+        # Mean pooling over real tokens, as sentence-transformers does.
+        token_embeddings = self._session.run(None, inputs)[0]
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return pooled.astype(np.float32)
+
+
+def _create_embedder() -> Embedder:
+    model_dir = os.getenv("SEMANTIC_CACHE_ONNX_MODEL")
+    if model_dir:
+        logger.info("Semantic cache using local ONNX embeddings from {}", model_dir)
+        return OnnxEmbedder(model_dir)
+    return _openai_embed
+
+
+# Every word of every menu item name. Callers rarely say a full item name
+# ("دبل" rather than "برجر دبل"), so each word is matched on its own, and as a
+# substring so attached prefixes like و and ال still match.
+_MENU_WORDS = frozenset(
+    word
+    for section in ("burgers", "sides", "drinks")
+    for item in _MENU[section]
+    for word in item["name"].split()
+)
+
+_DIGITS_RE = re.compile(r"\d+")
+
+
+class SemanticResponseCache:
+    """In-memory semantic cache of assistant replies, shared across sessions.
+
+    Only the first user turn of a call, right after the greeting, is cached.
+    Later turns refer to what has been ordered so far, so they always go to the
+    LLM and are never embedded. That first turn is often the order itself, and
+    two orders that differ by one item can embed above the threshold, so a hit
+    also requires both queries to name the same menu items and numbers.
+    """
+
+    def __init__(
+        self,
+        embed: Embedder = _openai_embed,
+        *,
+        threshold: float = 0.92,
+        max_entries: int = 1024,
+    ):
+        self._embed = embed
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._keys: Optional[np.ndarray] = None
+        self._signatures: List[FrozenSet[str]] = []
+        self._responses: List[str] = []
+
+    @staticmethod
+    def cacheable_query(messages: Sequence[dict]) -> Optional[str]:
+        """Return the user message to look up, or None if the turn has state.
+
+        A turn is cacheable when the context ends with a plain-text user message
+        and nothing but the system prompt and a text-only greeting precede it.
+        """
+        if not messages or messages[-1].get("role") != "user":
+            return None
+        query = messages[-1].get("content")
+        if not isinstance(query, str) or not query.strip():
+            return None
+
+        history = [m for m in messages[:-1] if m.get("role") != "system"]
+        if len(history) > 1:
+            return None
+        if history and (history[0].get("role") != "assistant" or history[0].get("tool_calls")):
+            return None
+        return query
+
+    @staticmethod
+    def order_signature(query: str) -> FrozenSet[str]:
+        """Return the menu words and digit runs that appear in a user message."""
+        words = {word for word in _MENU_WORDS if word in query}
+        return frozenset(words.union(_DIGITS_RE.findall(query)))
+
+    async def embed(self, query: str) -> np.ndarray:
+        """Embed a user message into a unit vector."""
+        vector = (await self._embed([query]))[0]
+        return vector / np.linalg.norm(vector)
+
+    def lookup(self, key: np.ndarray, signature: FrozenSet[str]) -> Optional[str]:
+        """Return the cached reply for the closest entry with the same signature."""
+        if self._keys is None:
+            return None
+
+        same_order = np.fromiter(
+            (s == signature for s in self._signatures), dtype=bool, count=len(self._signatures)
+        )
+        scores = np.where(same_order, self._keys @ key, -1.0)
+        best = int(np.argmax(scores))
+        if scores[best] < self._threshold:
+            return None
+        return self._responses[best]
+
+    def store(self, key: np.ndarray, signature: FrozenSet[str], response: str):
+        """Insert a reply, evicting the oldest entry once the cache is full."""
+        if self._keys is None:
+            self._keys = key[None, :]
+        else:
+            self._keys = np.vstack((self._keys, key))[-self._max_entries :]
+        self._signatures.append(signature)
+        del self._signatures[: -self._max_entries]
+        self._responses.append(response)
+        del self._responses[: -self._max_entries]
+
+
+class SemanticCacheProcessor(FrameProcessor):
+    """Answers repeated questions from a SemanticResponseCache instead of the LLM.
+
+    Place this processor just before the LLM and the processor returned by
+    `capture()` just after it, so replies to cache misses get stored.
+    """
+
+    def __init__(self, cache: SemanticResponseCache, **kwargs):
+        super().__init__(**kwargs)
+        self._cache = cache
+        self._pending: Optional[Tuple[np.ndarray, FrozenSet[str]]] = None
+        self._capture = SemanticCacheCapture(self)
+
+    def capture(self) -> "SemanticCacheCapture":
+        return self._capture
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, OpenAILLMContextFrame) and direction == FrameDirection.DOWNSTREAM:
+            self._pending = None
+            # Turns that depend on the order so far skip the embedding call and
+            # go straight to the LLM.
+            query = self._cache.cacheable_query(frame.context.messages)
+            key = None
+            if query is not None:
+                try:
+                    key = await self._cache.embed(query)
+                except Exception as e:
+                    logger.warning("{}: unable to embed user message: {}", self, e)
+
+            if key is not None:
+                signature = self._cache.order_signature(query)
+                response = self._cache.lookup(key, signature)
+                if response is not None:
+                    logger.debug("{}: semantic cache hit", self)
+                    await self.push_frame(LLMFullResponseStartFrame())
+                    await self.push_frame(LLMTextFrame(response))
+                    await self.push_frame(LLMFullResponseEndFrame())
+                    return
+                self._pending = (key, signature)
+
+        await self.push_frame(frame, direction)
+
+    def _store(self, response: str):
+        if self._pending is not None:
+            key, signature = self._pending
+            self._cache.store(key, signature, response)
+            self._pending = None
+
+    def _discard(self):
+        self._pending = None
+
+
+class SemanticCacheCapture(FrameProcessor):
+    """Collects the LLM reply to a cache miss and stores it in the cache."""
+
+    def __init__(self, lookup: SemanticCacheProcessor, **kwargs):
+        super().__init__(**kwargs)
+        self._lookup = lookup
+        self._text: List[str] = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMFullResponseStartFrame):
+            self._text = []
+        elif isinstance(frame, LLMTextFrame):
+            self._text.append(frame.text)
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            # Replies that only contain a function call have no text; keep
+            # waiting for the follow-up completion in that case.
+            response = "".join(self._text).strip()
+            if response:
+                self._lookup._store(response)
+            self._text = []
+        elif isinstance(frame, InterruptionFrame):
+            # Never cache a reply the user talked over.
+            self._lookup._discard()
+            self._text = []
+
+        await self.push_frame(frame, direction)
+
+
+# Shared by all sessions so answers learned on one call serve the next.
+_semantic_cache = SemanticResponseCache(_create_embedder())
+
+
+# A sentence ends at a newline, or at . ! ? ؟ followed by whitespace. Requiring
+# the whitespace keeps decimals like "3.5" and runs like "?!" in one piece.
+_SENTENCE_END_RE = re.compile(r"[.!?؟](?=\s)|\n")
+
+
+def _find_sentence_end(text: str) -> int:
+    """Return the index just past the last sentence end in `text`, or 0."""
+    end = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        end = match.end()
+    return end
+
+
+class TTSBatcher(FrameProcessor):
+    """Groups streamed LLM text into fewer, larger TTS requests.
+
+    The first sentence of each response is released as soon as it is complete
+    to keep time-to-first-byte low. Later sentences are held until at least
+    `max_chars` characters are buffered, so each websocket message to the TTS
+    service carries more text. Text is only split at sentence ends; whatever
+    is left when the response ends is flushed as is.
+    """
+
+    def __init__(self, *, max_chars: int = 80, **kwargs):
+        super().__init__(**kwargs)
+        self._max_chars = max_chars
+        self._text = ""
+        self._first_sentence_sent = False
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMTextFrame):
+            await self._aggregate(frame.text)
+            return
+
+        if isinstance(frame, LLMFullResponseStartFrame):
+            self._reset()
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            await self._flush()
+        elif isinstance(frame, InterruptionFrame):
+            self._reset()
+
+        await self.push_frame(frame, direction)
+
+    async def _aggregate(self, text: str):
+        self._text += text
+
+        if self._first_sentence_sent and len(self._text) < self._max_chars:
+            return
+        # The whole buffer is rescanned: a terminator at the end of an earlier
+        # chunk only becomes a sentence end once whitespace follows it.
+        cut = _find_sentence_end(self._text)
+        if not cut:
+            return
+
+        # Flush up to the last sentence end and keep the remainder buffered.
+        sentences, self._text = self._text[:cut], self._text[cut:]
+        self._first_sentence_sent = True
+        await self.push_frame(LLMTextFrame(sentences))
+
+    async def _flush(self):
+        text = self._text
+        self._reset()
+        if text:
+            await self.push_frame(LLMTextFrame(text))
+
+    def _reset(self):
+        self._text = ""
+        self._first_sentence_sent = False
+
+
+def _daily_params():
+    # Imported here so the Daily native SDK only loads when Daily is selected.
+    from pipecat.transports.daily.transport import DailyParams
+
+    return DailyParams(
         audio_in_enabled=True,
         audio_out_enabled=True,
         video_out_enabled=False,
-    ),
-    "twilio": lambda: FastAPIWebsocketParams(
+    )
+
+
+def _twilio_params():
+    from pipecat.transports.websocket.fastapi import FastAPIWebsocketParams
+
+    return FastAPIWebsocketParams(
         audio_in_enabled=True,
         audio_out_enabled=True,
-    ),
+    )
+
+
+# We store functions so objects don't get instantiated.
+# The function will be called when the desired transport gets selected.
+transport_params = {
+    "daily": _daily_params,
+    "twilio": _twilio_params,
     "webrtc": lambda: TransportParams(
         audio_in_enabled=True,
         audio_out_enabled=True,
@@ -104,6 +786,9 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
     """
     logger.info("Starting Arabic Voice Agent with RTVI Support")
 
+    # Warm up connections while the services and transport are being set up
+    warmup = asyncio.create_task(_warmup())
+
     # Configure Speechmatics STT for Arabic with diarization
     stt = SpeechmaticsSTTService(
         api_key=os.getenv("SPEECHMATICS_API_KEY"),
@@ -118,60 +803,47 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
         ),
     )
 
+    # Throttle the partial transcripts that reach the user context aggregator
+    transcript_coalescer = PartialTranscriptCoalescer()
+
     # Transcription logger to see who said what
     transcription_logger = TranscriptionLogger()
 
     # Configure OpenAI LLM (GPT-4 recommended for Arabic)
-    llm = OpenAILLMService(
+    llm = ArabicOpenAILLMService(
         api_key=os.getenv("OPENAI_API_KEY"),
         model=os.getenv("OPENAI_MODEL", "gpt-4o"),
+        params=OpenAILLMService.InputParams(
+            # Route every session to the same prompt-cache shard so the shared
+            # system prompt prefix is served from cache after the first turn.
+            # Sent through extra_body so SDKs predating the prompt_cache_key
+            # argument still accept it.
+            extra={
+                "extra_body": {
+                    "prompt_cache_key": os.getenv("OPENAI_PROMPT_CACHE_KEY", "sara-ar-v1")
+                }
+            },
+        ),
     )
+    llm.register_function("get_menu", _get_menu)
 
     # Configure ElevenLabs TTS for Arabic with text frame emission enabled
     tts = ElevenLabsTTSTranscriptService(
         api_key=os.getenv("ELEVENLABS_API_KEY"),
         voice_id=os.getenv("ELEVENLABS_VOICE_ID", "tavIIPLplRB883FzWU0V"),
         model=os.getenv("ELEVENLABS_MODEL", "eleven_multilingual_v2"),
+        # Sentence aggregation is done upstream by TTSBatcher; the service
+        # sends each batch over the input-streaming websocket as it arrives.
+        aggregate_sentences=False,
         params=ElevenLabsTTSService.InputParams(
             stability=0.65,
             similarity_boost=0.60,
+            # Synthesize each flushed sentence immediately rather than buffering
+            # text server-side until ElevenLabs' chunk length schedule is met.
+            auto_mode=True,
         ),
     )
 
-    # System prompt for the Arabic agent
-    messages = [
-    {
-        "role": "system",
-        "content": (
-            "The user will be speaking Arabic. ONLY ever respond using Modern Standard Arabic (MSA). Assume the speaker is male unless they have told you otherwise.\n\n"
-            "أنت موظف استقبال ودود في مطعم برجر. اسمك سارة. "
-            "هدفك هو أخذ الطلبات بطريقة سريعة وواضحة ومساعدة العملاء في اختيار وجباتهم. "
-            "مخرجاتك ستتحول إلى صوت لذا لا تستخدم رموزًا خاصة أو إيموجي في إجاباتك. "
-            "استخدم علامات الترقيم دائمًا في ردودك. "
-            "قدم ردودًا قصيرة ومباشرة - لا تطيل إلا إذا لزم الأمر. "
-            "\n\n"
-            "قائمة الطعام:\n"
-            "- برجر كلاسيك (٢٥ ريال)\n"
-            "- برجر دبل (٣٥ ريال)\n"
-            "- برجر نباتي فلافل (٢٢ ريال)\n"
-            "- برجر خضار مشوي (٢٤ ريال)\n"
-            "- بطاطس مقلية صغيرة (٨ ريال) أو كبيرة (١٢ ريال)\n"
-            "- مشروبات: كولا، سبرايت، عصير برتقال (٧ ريال)\n"
-            "- ميلك شيك فانيليا أو شوكولاتة (١٥ ريال)\n"
-            "\n"
-            "عند أخذ الطلب:\n"
-            "١. رحب بالعميل واسأله عن طلبه\n"
-            "٢. استخدم علامات `<S1/>` `<S2/>` `<S3/>` لتمييز المتحدثين المختلفين - لا تستخدم هذه العلامات في ردودك أبدًا\n"
-            "٣. سجل من طلب ماذا بوضوح (مثال: الشخص الأول طلب برجر كلاسيك)\n"
-            "٤. اقترح الخيارات النباتية إذا سأل العميل أو بدا مهتمًا\n"
-            "٥. اسأل عن الإضافات: بطاطس ومشروبات\n"
-            "٦. أكد الطلب الكامل مع الأسعار قبل الإنهاء\n"
-            "٧. اذكر المجموع النهائي\n"
-            "\n"
-            "كن ودودًا وصبورًا ومساعدًا. إذا كان هناك عدة أشخاص يطلبون، تأكد من تتبع طلب كل شخص بدقة."
-        ),
-    },
-    ]
     # Create RTVI processor with configuration
     rtvi = RTVIProcessor(config=RTVIConfig(config=[]))
 
@@ -179,11 +851,17 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
     transcripts = TranscriptProcessor()
 
     # Create shared OpenAI LLM context and aggregators for user/assistant messages
-    context = OpenAILLMContext.from_messages(messages)
+    context = OpenAILLMContext(messages=list(_SYSTEM_MESSAGES), tools=_TOOLS)
     context_aggregators = llm.create_context_aggregator(context)
     user_response = context_aggregators.user()
     assistant_response = context_aggregators.assistant()
 
+    # Batch LLM text into sentence groups before it reaches the TTS websocket
+    tts_batcher = TTSBatcher()
+
+    # Serve repeated questions (prices, vegetarian options...) without an LLM call
+    semantic_cache = SemanticCacheProcessor(_semantic_cache)
+
     user_transcript = transcripts.user()
     assistant_transcript = transcripts.assistant()
 
@@ -193,10 +871,14 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
             transport.input(),  # Audio input
             rtvi,  # RTVI processor for handling client-server messages
             stt,  # Speech-to-text (Arabic, with diarization)
+            transcript_coalescer,  # Forward at most one partial transcript per 80ms
             transcription_logger,  # Log transcriptions with speaker info (for debugging)
             user_transcript,  # Process user transcripts (with diarization tags)
             user_response,  # Aggregate user messages
+            semantic_cache,  # Answer repeated questions from the semantic cache
             llm,  # LLM processing
+            semantic_cache.capture(),  # Store fresh LLM replies in the semantic cache
+            tts_batcher,  # Group LLM text into sentence batches for TTS
             tts,  # Text-to-speech (Arabic) - emits TTSTextFrames
             transport.output(),  # Audio output
             assistant_transcript,  # Process assistant transcripts (uses TTSTextFrames)
@@ -218,7 +900,9 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
     # Event handler for when first participant joins
     @transport.event_handler("on_first_participant_joined")
     async def on_first_participant_joined(transport, participant):
-        logger.info(f"First participant joined: {participant.get('identity', 'unknown')}")
+        logger.opt(lazy=True).info(
+            "First participant joined: {}", lambda: participant.get("identity", "unknown")
+        )
         # Initialize the conversation with the system prompt
         await task.queue_frames([OpenAILLMContextFrame(context)])
 
@@ -237,11 +921,15 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
 
     # Run the pipeline
     runner = PipelineRunner(handle_sigint=runner_args.handle_sigint)
-    await runner.run(task)
+    try:
+        await runner.run(task)
+    finally:
+        warmup.cancel()
 
 
 async def bot(runner_args: RunnerArguments):
     """Main bot entry point compatible with Pipecat Cloud."""
+    _configure_logging()
     transport = await create_transport(runner_args, transport_params)
     await run_bot(transport, runner_args)
 
@@ -249,4 +937,8 @@ async def bot(runner_args: RunnerArguments):
 if __name__ == "__main__":
     from pipecat.runner.run import main
 
-    main()
\ No newline at end of file
+    # Keep the runner's own -v/--verbose level once bot() replaces its sink.
+    if any(arg == "--verbose" or re.fullmatch(r"-v+", arg) for arg in sys.argv[1:]):
+        _default_log_level = "TRACE"
+
+    main()
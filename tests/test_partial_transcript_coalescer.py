@@ -0,0 +1,66 @@
+import asyncio
+
+from pipecat.frames.frames import (
+    InputAudioRawFrame,
+    InterimTranscriptionFrame,
+    TranscriptionFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+
+from agent import PartialTranscriptCoalescer
+
+
+class RecordingCoalescer(PartialTranscriptCoalescer):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.pushed = []
+
+    async def push_frame(self, frame, direction=FrameDirection.DOWNSTREAM):
+        self.pushed.append(frame)
+
+
+def interim(text):
+    return InterimTranscriptionFrame(text=text, user_id="", timestamp="")
+
+
+def audio():
+    return InputAudioRawFrame(audio=b"\x00\x00", sample_rate=16000, num_channels=1)
+
+
+def run(coalescer, frames):
+    async def feed():
+        for frame in frames:
+            await coalescer.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+    asyncio.run(feed())
+    return coalescer.pushed
+
+
+def test_held_interim_is_forwarded_before_user_stopped_speaking():
+    coalescer = RecordingCoalescer(interval_secs=60)
+    first, second, stopped = interim("مرحبا"), interim("مرحبا أريد"), UserStoppedSpeakingFrame()
+
+    pushed = run(coalescer, [first, audio(), second, audio(), stopped])
+
+    interims = [f for f in pushed if isinstance(f, InterimTranscriptionFrame)]
+    assert interims == [first, second]
+    assert pushed.index(second) < pushed.index(stopped)
+
+
+def test_rapid_interims_are_coalesced_to_the_newest():
+    coalescer = RecordingCoalescer(interval_secs=60)
+    frames = [interim("أ"), interim("أر"), interim("أري"), UserStoppedSpeakingFrame()]
+
+    pushed = run(coalescer, frames)
+
+    assert [f.text for f in pushed if isinstance(f, InterimTranscriptionFrame)] == ["أ", "أري"]
+
+
+def test_final_transcript_supersedes_held_interim():
+    coalescer = RecordingCoalescer(interval_secs=60)
+    final = TranscriptionFrame(text="أريد برجر", user_id="", timestamp="")
+
+    pushed = run(coalescer, [interim("أ"), interim("أريد"), final])
+
+    assert [f.text for f in pushed] == ["أ", "أريد برجر"]
@@ -0,0 +1,75 @@
+import numpy as np
+
+from agent import SemanticResponseCache
+
+SYSTEM = {"role": "system", "content": "system prompt"}
+GREETING = {"role": "assistant", "content": "أهلا بك، ماذا تحب أن تطلب؟"}
+
+
+def test_first_question_after_greeting_is_cacheable():
+    messages = [SYSTEM, GREETING, {"role": "user", "content": "كم سعر البرجر؟"}]
+    assert SemanticResponseCache.cacheable_query(messages) == "كم سعر البرجر؟"
+
+
+def test_turns_after_an_order_are_not_cacheable():
+    messages = [
+        SYSTEM,
+        GREETING,
+        {"role": "user", "content": "طلبت برجر كلاسيك وبطاطس كبيرة"},
+        {"role": "assistant", "content": "تمام، هل تريد مشروبًا؟"},
+        {"role": "user", "content": "لا، كم المجموع؟"},
+    ]
+    assert SemanticResponseCache.cacheable_query(messages) is None
+
+
+def test_tool_calls_make_the_turn_stateful():
+    messages = [
+        SYSTEM,
+        {"role": "assistant", "tool_calls": [{"id": "1", "type": "function"}]},
+        {"role": "user", "content": "كم سعر البرجر؟"},
+    ]
+    assert SemanticResponseCache.cacheable_query(messages) is None
+
+
+def test_context_not_ending_with_user_text_is_not_cacheable():
+    assert SemanticResponseCache.cacheable_query([SYSTEM]) is None
+    assert SemanticResponseCache.cacheable_query([SYSTEM, {"role": "user", "content": []}]) is None
+
+
+def test_lookup_matches_above_threshold_only():
+    cache = SemanticResponseCache(threshold=0.9)
+    key = np.array([1.0, 0.0], dtype=np.float32)
+    cache.store(key, frozenset(), "٢٥ ريال")
+
+    assert cache.lookup(key, frozenset()) == "٢٥ ريال"
+    assert cache.lookup(np.array([0.0, 1.0], dtype=np.float32), frozenset()) is None
+
+
+def test_orders_that_differ_by_one_item_do_not_match():
+    cache = SemanticResponseCache(threshold=0.9)
+    key = np.array([1.0, 0.0], dtype=np.float32)
+    classic = "أريد برجر كلاسيك وبطاطس كبيرة"
+    double = "أريد برجر دبل وبطاطس كبيرة"
+    cache.store(key, cache.order_signature(classic), "برجر كلاسيك وبطاطس كبيرة، ٣٧ ريال.")
+
+    # Even with identical embeddings, a different item must go to the LLM.
+    assert cache.lookup(key, cache.order_signature(double)) is None
+    assert cache.lookup(key, cache.order_signature(classic)) is not None
+
+
+def test_order_signature_includes_menu_words_and_digits():
+    assert SemanticResponseCache.order_signature("أريد 2 برجر دبل والكولا") == frozenset(
+        {"2", "برجر", "دبل", "كولا"}
+    )
+    assert SemanticResponseCache.order_signature("مرحبا") == frozenset()
+
+
+def test_store_evicts_oldest_entries():
+    cache = SemanticResponseCache(max_entries=2)
+    for i in range(3):
+        key = np.zeros(3, dtype=np.float32)
+        key[i] = 1.0
+        cache.store(key, frozenset(), f"reply {i}")
+
+    assert cache.lookup(np.array([1.0, 0.0, 0.0], dtype=np.float32), frozenset()) is None
+    assert cache.lookup(np.array([0.0, 0.0, 1.0], dtype=np.float32), frozenset()) == "reply 2"
@@ -0,0 +1,136 @@
+import asyncio
+
+import numpy as np
+from pipecat.frames.frames import (
+    InterruptionFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+)
+from pipecat.processors.aggregators.openai_llm_context import (
+    OpenAILLMContext,
+    OpenAILLMContextFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+
+from agent import SemanticCacheCapture, SemanticCacheProcessor, SemanticResponseCache
+
+SYSTEM = {"role": "system", "content": "system prompt"}
+QUESTION = "كم سعر البرجر؟"
+
+
+async def embed(texts):
+    return np.ones((len(texts), 2), dtype=np.float32)
+
+
+class RecordingCacheProcessor(SemanticCacheProcessor):
+    def __init__(self, cache, **kwargs):
+        super().__init__(cache, **kwargs)
+        self.pushed = []
+
+    async def push_frame(self, frame, direction=FrameDirection.DOWNSTREAM):
+        self.pushed.append(frame)
+
+
+class RecordingCapture(SemanticCacheCapture):
+    def __init__(self, lookup, **kwargs):
+        super().__init__(lookup, **kwargs)
+        self.pushed = []
+
+    async def push_frame(self, frame, direction=FrameDirection.DOWNSTREAM):
+        self.pushed.append(frame)
+
+    async def _start_interruption(self):
+        # There is no process task to restart outside a running pipeline.
+        pass
+
+
+def context_frame(query=QUESTION):
+    return OpenAILLMContextFrame(OpenAILLMContext([SYSTEM, {"role": "user", "content": query}]))
+
+
+def reply(*texts):
+    return [
+        LLMFullResponseStartFrame(),
+        *(LLMTextFrame(t) for t in texts),
+        LLMFullResponseEndFrame(),
+    ]
+
+
+def run(processor, frames, direction=FrameDirection.DOWNSTREAM):
+    async def feed():
+        for frame in frames:
+            await processor.process_frame(frame, direction)
+
+    asyncio.run(feed())
+    return processor.pushed
+
+
+def cached(cache, query=QUESTION):
+    key = asyncio.run(cache.embed(query))
+    return cache.lookup(key, cache.order_signature(query))
+
+
+def test_hit_answers_without_forwarding_the_context():
+    cache = SemanticResponseCache(embed)
+    cache.store(asyncio.run(cache.embed(QUESTION)), cache.order_signature(QUESTION), "٢٥ ريال.")
+    frame = context_frame()
+
+    pushed = run(RecordingCacheProcessor(cache), [frame])
+
+    assert frame not in pushed
+    assert [type(f) for f in pushed] == [
+        LLMFullResponseStartFrame,
+        LLMTextFrame,
+        LLMFullResponseEndFrame,
+    ]
+    assert pushed[1].text == "٢٥ ريال."
+
+
+def test_miss_stores_the_reply_on_response_end():
+    cache = SemanticResponseCache(embed)
+    processor = RecordingCacheProcessor(cache)
+    capture = RecordingCapture(processor)
+    frame = context_frame()
+
+    assert run(processor, [frame]) == [frame]
+    run(capture, reply("٢٥ ", "ريال."))
+
+    assert cached(cache) == "٢٥ ريال."
+
+
+def test_function_call_response_waits_for_the_follow_up_completion():
+    cache = SemanticResponseCache(embed)
+    processor = RecordingCacheProcessor(cache)
+    capture = RecordingCapture(processor)
+    run(processor, [context_frame()])
+
+    run(capture, reply())
+    assert cached(cache) is None
+
+    run(capture, reply("٢٥ ريال."))
+    assert cached(cache) == "٢٥ ريال."
+
+
+def test_interruption_discards_the_pending_reply():
+    cache = SemanticResponseCache(embed)
+    processor = RecordingCacheProcessor(cache)
+    capture = RecordingCapture(processor)
+    run(processor, [context_frame()])
+
+    run(capture, [LLMFullResponseStartFrame(), LLMTextFrame("٢٥"), InterruptionFrame()])
+    run(capture, reply("٢٥ ريال."))
+
+    assert cached(cache) is None
+
+
+def test_upstream_context_frames_are_ignored():
+    cache = SemanticResponseCache(embed)
+    processor = RecordingCacheProcessor(cache)
+    capture = RecordingCapture(processor)
+    frame = context_frame()
+
+    assert run(processor, [frame], FrameDirection.UPSTREAM) == [frame]
+    run(capture, reply("٢٥ ريال."))
+
+    assert cached(cache) is None
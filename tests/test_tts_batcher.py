@@ -0,0 +1,106 @@
+import asyncio
+
+from pipecat.frames.frames import (
+    InterruptionFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    TextFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+
+from agent import TTSBatcher, _find_sentence_end
+
+
+class RecordingTTSBatcher(TTSBatcher):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.pushed = []
+
+    async def push_frame(self, frame, direction=FrameDirection.DOWNSTREAM):
+        self.pushed.append(frame)
+
+    async def _start_interruption(self):
+        # There is no process task to restart outside a running pipeline.
+        pass
+
+
+def run(batcher, frames):
+    async def feed():
+        for frame in frames:
+            await batcher.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+    asyncio.run(feed())
+    return batcher.pushed
+
+
+def response(chunks):
+    return [
+        LLMFullResponseStartFrame(),
+        *(LLMTextFrame(c) for c in chunks),
+        LLMFullResponseEndFrame(),
+    ]
+
+
+def run_batcher(chunks, **kwargs):
+    pushed = run(RecordingTTSBatcher(**kwargs), response(chunks))
+    return [frame.text for frame in pushed if isinstance(frame, LLMTextFrame)]
+
+
+def test_sentence_end_requires_following_whitespace():
+    assert _find_sentence_end("السعر 3.5 ريال") == 0
+    assert _find_sentence_end("السعر 3.") == 0
+    assert _find_sentence_end("مرحبا. كيف") == len("مرحبا.")
+    assert _find_sentence_end("هل تريد بطاطس؟ ") == len("هل تريد بطاطس؟")
+    assert _find_sentence_end("حقا?! نعم") == len("حقا?!")
+    assert _find_sentence_end("سطر\nآخر") == len("سطر\n")
+
+
+def test_decimal_split_across_chunks_stays_together():
+    assert run_batcher(["السعر 3.", "5 ريال."]) == ["السعر 3.5 ريال."]
+
+
+def test_first_sentence_is_released_immediately():
+    texts = run_batcher(["مرحبا", " بك.", " كيف", " أساعدك؟"], max_chars=80)
+    assert texts == ["مرحبا بك.", " كيف أساعدك؟"]
+
+
+def test_later_sentences_are_batched_up_to_max_chars():
+    chunks = ["أهلا.", " هل", " تريد", " برجر؟", " أو", " بطاطس", " كبيرة؟", " شكرا."]
+    texts = run_batcher(chunks, max_chars=35)
+    assert texts == ["أهلا.", " هل تريد برجر؟ أو بطاطس كبيرة؟", " شكرا."]
+    assert "".join(texts) == "".join(chunks)
+
+
+def test_response_end_flushes_leftover_text_before_forwarding_end():
+    pushed = run(RecordingTTSBatcher(), response(["مرحبا.", " كيف"]))
+
+    assert [type(f) for f in pushed] == [
+        LLMFullResponseStartFrame,
+        LLMTextFrame,
+        LLMTextFrame,
+        LLMFullResponseEndFrame,
+    ]
+    assert pushed[2].text == " كيف"
+
+
+def test_response_start_clears_the_buffer():
+    batcher = RecordingTTSBatcher()
+    run(batcher, [LLMTextFrame("بقايا"), *response(["أهلا"])])
+
+    assert [f.text for f in batcher.pushed if isinstance(f, LLMTextFrame)] == ["أهلا"]
+
+
+def test_interruption_clears_the_buffer():
+    batcher = RecordingTTSBatcher()
+    interruption = InterruptionFrame()
+    run(batcher, [LLMFullResponseStartFrame(), LLMTextFrame("مرحبا"), interruption])
+    run(batcher, [LLMFullResponseEndFrame()])
+
+    assert interruption in batcher.pushed
+    assert not [f for f in batcher.pushed if isinstance(f, LLMTextFrame)]
+
+
+def test_other_frames_pass_through_unchanged():
+    frame = TextFrame("نص")
+    assert run(RecordingTTSBatcher(), [frame]) == [frame]